@@ -0,0 +1,65 @@
+"""
+Report BatchValidator throughput in lines per second, and peak memory, for a generated NDJSON file.
+Peak memory should stay flat as the number of lines grows.
+
+Usage: python benchmarks/batch_validate.py [lines] [workers]
+"""
+
+import sys
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from os.path import abspath, dirname
+from tempfile import TemporaryFile
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from collection_plus_json import BatchValidator
+
+LINE = (
+    '{{"href": "http://example.com/people/{i}", '
+    '"data": [{{"name": "full-name", "value": "Person {i}"}}, {{"name": "email", "value": "person{i}@example.com"}}], '
+    '"links": [{{"href": "http://example.com/people/{i}/blog", "rel": "blog"}}]}}\n'
+)
+
+
+def write_stream(stream, lines):
+    for i in range(lines):
+        # one bad line in every thousand
+        stream.write("not json\n" if i % 1000 == 999 else LINE.format(i=i))
+    stream.seek(0)
+
+
+def run(name, stream, executor=None, trace=False):
+    stream.seek(0)
+    validator = BatchValidator(executor=executor)
+    if trace:
+        tracemalloc.start()
+    for _ in validator.validate(stream):
+        pass
+    if trace:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print("{name:>12}: peak {peak:.1f} KiB for {lines} lines".format(
+            name=name, peak=peak / 1024, lines=validator.lines
+        ))
+    else:
+        print("{name:>12}: {lps:10.0f} lines/s, {valid} valid, {errors} errors".format(
+            name=name, lps=validator.lines_per_second, valid=validator.valid, errors=len(validator.errors)
+        ))
+
+
+def main(lines=100000, workers=4):
+    with TemporaryFile("w+") as stream:
+        write_stream(stream, lines)
+        run("inline", stream)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            run("{n} processes".format(n=workers), stream, executor)
+        # tracing slows everything down, so memory is measured in separate passes
+        run("inline", stream, trace=True)
+    with TemporaryFile("w+") as stream:
+        write_stream(stream, lines // 10)
+        run("inline", stream, trace=True)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,43 @@
+"""
+Time Collection.etag() on a large collection: the first call, repeat calls on an unchanged collection,
+and the call after changing a single Data value.
+
+Usage: python benchmarks/etag.py [items]
+"""
+
+import sys
+import time
+from os.path import abspath, dirname
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from collection_plus_json import Collection
+
+
+def timed(name, func):
+    start = time.perf_counter()
+    result = func()
+    print("{name:>16}: {ms:10.3f} ms".format(name=name, ms=(time.perf_counter() - start) * 1000))
+    return result
+
+
+def main(size=100000):
+    collection = Collection(
+        href="http://example.com/people/",
+        items=[
+            {
+                "href": "http://example.com/people/{i}".format(i=i),
+                "data": [{"name": "full-name", "value": "Person {i}".format(i=i)}],
+                "links": [{"href": "http://example.com/people/{i}/blog".format(i=i), "rel": "blog"}]
+            } for i in range(size)
+        ]
+    )
+    timed("str()", lambda: str(collection))
+    timed("first etag()", collection.etag)
+    timed("unchanged etag()", collection.etag)
+    collection.items[size // 2].data[0].value = "Someone Else"
+    timed("changed etag()", collection.etag)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
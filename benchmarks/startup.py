@@ -0,0 +1,65 @@
+"""
+Track import time and first-construct latency of collection_plus_json in a fresh interpreter.
+
+Import time comes from `python -X importtime`, first-construct latency is the time to build
+and serialize a small Collection right after importing.
+
+Usage: python benchmarks/startup.py [runs]
+"""
+
+import subprocess
+import sys
+from os.path import abspath, dirname
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+FIRST_CONSTRUCT = """
+import time
+start = time.perf_counter()
+from collection_plus_json import Collection
+imported = time.perf_counter()
+str(Collection(href="http://example.com/", items=[{"href": "http://example.com/1", "data": [{"name": "a"}]}]))
+constructed = time.perf_counter()
+print(imported - start, constructed - imported)
+"""
+
+
+def import_time():
+    """
+    :returns: tuple (self, cumulative) import time of the package in microseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import collection_plus_json"],
+        cwd=ROOT, stderr=subprocess.PIPE, universal_newlines=True, check=True
+    )
+    for line in result.stderr.splitlines():
+        own, cumulative, name = line.split(":", 1)[1].split("|")
+        if name.strip() == "collection_plus_json":
+            return int(own), int(cumulative)
+
+
+def first_construct():
+    """
+    :returns: tuple (import, construct) wall time in seconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_CONSTRUCT],
+        cwd=ROOT, stdout=subprocess.PIPE, universal_newlines=True, check=True
+    )
+    return tuple(float(t) for t in result.stdout.split())
+
+
+def main(runs=10):
+    import_times = sorted(import_time() for _ in range(runs))
+    construct_times = sorted(first_construct() for _ in range(runs))
+    own, cumulative = import_times[runs // 2]
+    imported, constructed = construct_times[runs // 2]
+    print("median of {runs} runs".format(runs=runs))
+    print("  -X importtime: {own} us self, {cumulative} us cumulative".format(own=own, cumulative=cumulative))
+    print("  import: {imported:.2f} ms, first construct: {constructed:.2f} ms".format(
+        imported=imported * 1000, constructed=constructed * 1000
+    ))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
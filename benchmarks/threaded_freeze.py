@@ -0,0 +1,68 @@
+"""
+Compare per-request allocation of sharing a frozen Collection between threads
+against deep-copying a mutable Collection for every request.
+
+Usage: python benchmarks/threaded_freeze.py [items] [requests] [threads]
+"""
+
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from os.path import abspath, dirname
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from collection_plus_json import Collection
+
+
+def build_collection(size):
+    return Collection(
+        href="http://example.com/people/",
+        items=[
+            {
+                "href": "http://example.com/people/{i}".format(i=i),
+                "data": [
+                    {"name": "full-name", "value": "Person {i}".format(i=i)},
+                    {"name": "email", "value": "person{i}@example.com".format(i=i)}
+                ],
+                "links": [{"href": "http://example.com/people/{i}/blog".format(i=i), "rel": "blog"}]
+            } for i in range(size)
+        ],
+        template={"data": [{"name": "full-name"}, {"name": "email"}]}
+    )
+
+
+def handle_copy(collection):
+    # what handlers had to do before freeze(): copy, then read
+    return len(deepcopy(collection).items)
+
+
+def handle_frozen(collection):
+    return len(collection.items)
+
+
+def run(name, handler, collection, requests, threads):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for _ in pool.map(handler, [collection] * requests):
+            pass
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("{name:>8}: {rps:10.1f} requests/s, peak {peak:10.1f} KiB ({per:.1f} KiB per request)".format(
+        name=name, rps=requests / elapsed, peak=peak / 1024, per=peak / 1024 / requests
+    ))
+
+
+def main(size=1000, requests=200, threads=8):
+    collection = build_collection(size)
+    run("deepcopy", handle_copy, collection, requests, threads)
+    collection.freeze()
+    run("frozen", handle_frozen, collection, requests, threads)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
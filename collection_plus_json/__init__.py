@@ -0,0 +1,33 @@
+__author__ = 'Ian S. Evans'
+__version__ = '0.0.4'
+
+from importlib import import_module as _import_module
+
+from .core import (
+    MIMETYPE, Array, Collection, CollectionArrayField, CollectionField, Comparable, Data, Error, Freezable, Item, Link,
+    Query, RequiresProperties, Serializable, Template
+)
+
+# Heavier features live in their own submodules and are only imported on first use,
+# so that importing the package (and constructing a Collection) stays cheap.
+# Maps attribute name -> submodule name.
+_lazy_attributes = {
+    "BatchValidator": "batch"
+}
+
+__all__ = [
+    "MIMETYPE", "Array", "Collection", "CollectionArrayField", "CollectionField", "Comparable", "Data", "Error",
+    "Freezable", "Item", "Link", "Query", "RequiresProperties", "Serializable", "Template"
+] + sorted(_lazy_attributes)
+
+
+def __getattr__(name):
+    if name in _lazy_attributes:
+        value = getattr(_import_module("." + _lazy_attributes[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module {module!r} has no attribute {name!r}".format(module=__name__, name=name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes))
@@ -0,0 +1,140 @@
+__author__ = 'Ian S. Evans'
+
+from collections import deque
+from json import loads
+from os import cpu_count
+from time import perf_counter
+
+from .core import Error, Item
+
+
+def validate_line(line):
+    """
+    Build an Item from one line of newline-delimited JSON.
+    :param line: str or bytes A JSON object representing an Item
+    :returns: Item
+    :raises ValueError, TypeError, AttributeError, RecursionError: If the line is not valid JSON or not a valid Item
+    """
+    obj = loads(line)
+    if not isinstance(obj, dict):
+        raise TypeError("Expected a JSON object, got {type}.".format(type=type(obj).__name__))
+    # these would set private attributes (e.g. __dict__) instead of non-standard properties
+    private = sorted(k for k in obj if k.startswith("_"))
+    if private:
+        raise ValueError("Private keys are not allowed: {keys}.".format(keys=", ".join(private)))
+    return Item(**obj)
+
+
+def validate_chunk(chunk):
+    """
+    Validate a chunk of lines. Module level so it can be sent to a process pool.
+    :param chunk: list of (line number, line) tuples
+    :returns: list of (line number, Item or Error) tuples, in the same order
+    """
+    results = []
+    for line_number, line in chunk:
+        try:
+            result = validate_line(line)
+        except (AttributeError, RecursionError, TypeError, ValueError) as e:
+            result = Error(
+                code="invalid_item",
+                message="Line {n}: {e}".format(n=line_number, e=e),
+                title="Invalid Item",
+                line=line_number
+            )
+        results.append((line_number, result))
+    return results
+
+
+class BatchValidator(object):
+    """
+    Validates newline-delimited JSON streams of Items, one Item per line.
+    Invalid lines are recorded as Error objects instead of stopping the batch.
+    Work can be fanned out to a concurrent.futures executor; valid Items are always yielded in their original order.
+    Memory use is bounded by chunk_size * max_pending lines, whatever the size of the stream.
+    """
+
+    def __init__(self, executor=None, chunk_size=1000, max_pending=None, errors=None):
+        """
+        :param executor: concurrent.futures.Executor to validate chunks with, None to validate in this thread.
+            Use a ProcessPoolExecutor for parallel validation, threads are limited by the GIL.
+        :param chunk_size: Number of lines sent to the executor at a time
+        :param max_pending: Maximum number of chunks submitted to the executor and not yet yielded,
+            defaults to twice the number of CPUs
+        :param errors: Where to append Error objects, defaults to a new list.
+            Pass something like deque(maxlen=n) to bound memory on very noisy input.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        self.executor = executor
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending or 2 * (cpu_count() or 1)
+        self.errors = [] if errors is None else errors
+        self.lines = 0
+        self.valid = 0
+        self.elapsed = 0.0
+
+    @property
+    def lines_per_second(self):
+        """
+        Lines validated per second of elapsed time.
+        Elapsed time only counts reading lines, validating them and waiting for the executor,
+        not the time spent by whatever consumes the yielded Items.
+        """
+        if not self.elapsed:
+            return 0.0
+        return self.lines / self.elapsed
+
+    def _chunks(self, stream):
+        chunk = []
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            chunk.append((line_number, line))
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _timed(self, func, *args):
+        start = perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.elapsed += perf_counter() - start
+
+    def _collect(self, results):
+        for line_number, result in results:
+            self.lines += 1
+            if isinstance(result, Error):
+                self.errors.append(result)
+            else:
+                self.valid += 1
+                yield result
+
+    def validate(self, stream):
+        """
+        Validate every line of a stream, skipping blank lines.
+        Line counts, errors and elapsed time accumulate on this object across calls.
+        :param stream: An iterable of lines, e.g. a file opened in text or binary mode
+        :returns: generator yielding the valid Items in their original order
+        """
+        chunks = self._chunks(stream)
+        pending = deque()
+        try:
+            while True:
+                chunk = self._timed(next, chunks, None)
+                if chunk is None:
+                    break
+                if self.executor is None:
+                    yield from self._collect(self._timed(validate_chunk, chunk))
+                    continue
+                pending.append(self._timed(self.executor.submit, validate_chunk, chunk))
+                if len(pending) >= self.max_pending:
+                    yield from self._collect(self._timed(pending.popleft().result))
+            while pending:
+                yield from self._collect(self._timed(pending.popleft().result))
+        finally:
+            for future in pending:
+                future.cancel()
@@ -1,8 +1,8 @@
 __author__ = 'Ian S. Evans'
-__version__ = '0.0.4'
 
 from json import dumps, JSONEncoder, loads
 from collections import UserList
+from weakref import ref
 
 MIMETYPE = "application/vnd.collection+json"
 
@@ -35,6 +35,7 @@ class CollectionField(object):
         if not isinstance(cls, type):
             raise TypeError("Parameter 'cls' must be a class. type(type(cls)) -> {cls}".format(cls=str(type(cls))))
         self.cls = cls
+        self.name = None
         self.truthy = truthy
         if not truthy:
             self.nullable = nullable
@@ -62,7 +63,13 @@ class CollectionField(object):
             raise ValueError("{name} cannot be deleted.".format(name=self.get_own_name(type(instance))))
         del instance.__dict__[self.get_own_name(type(instance))]
 
+    def __set_name__(self, owner, name):
+        self.name = name
+
     def get_own_name(self, owner):
+        # set by __set_name__ when the owner class is created, look it up when assigned to a class later
+        if self.name is not None:
+            return self.name
         for attr in dir(owner):
             if getattr(owner, attr) is self:
                 return attr
@@ -145,7 +152,161 @@ class Serializable(object):
         return serializable
 
 
-class Array(Serializable, Comparable, UserList):
+def _hashable(value):
+    """
+    Convert dicts, lists and sets in a value to hashable equivalents, for Freezable.__hash__.
+    Values that compare equal (e.g. 1, 1.0 and True) still hash equal afterwards.
+    """
+    if isinstance(value, dict):
+        return frozenset((k, _hashable(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_hashable(v) for v in value)
+    return value
+
+
+def _freeze(value):
+    """
+    Freeze value if it is Freezable, or any Freezable objects in it if it is a dict, list, tuple or set.
+    """
+    if isinstance(value, Freezable):
+        value.freeze()
+    elif isinstance(value, dict):
+        for v in value.values():
+            _freeze(v)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for v in value:
+            _freeze(v)
+
+
+class Freezable(object):
+    """
+    An object that can be frozen into an immutable, hashable form.
+    Frozen objects can be shared between threads and read without locking or copying.
+    Also tracks changes, so a cached digest of its contents can be dropped when it (or anything in it) is modified.
+    """
+
+    # name-mangled, so non-standard properties passed to constructors (e.g. _frozen) can't collide with them
+    __slots__ = ("__frozen", "__hash", "__digest", "__parents")
+
+    def __hash__(self):
+        if not self.frozen:
+            raise TypeError("unhashable type: '{cls}' (freeze it first)".format(cls=self.__class__.__name__))
+        value = getattr(self, "_Freezable__hash", None)
+        if value is None:
+            # hashed the way Comparable.__eq__ compares, so equal objects hash equal
+            # no lock needed, racing threads would compute and store the same value
+            value = hash((type(self), _hashable(self.__dict__)))
+            object.__setattr__(self, "_Freezable__hash", value)
+        return value
+
+    def __getstate__(self):
+        # leave out the cached digest and the objects containing this one
+        return self.__dict__, self.frozen
+
+    def __setattr__(self, key, value):
+        self._on_mutate()
+        super(Freezable, self).__setattr__(key, value)
+
+    def __setstate__(self, state):
+        # bypass __setattr__ so frozen objects can be unpickled and copied
+        state, frozen = state
+        self.__dict__.update(state)
+        object.__setattr__(self, "_Freezable__frozen", frozen)
+
+    def __delattr__(self, key):
+        self._on_mutate()
+        super(Freezable, self).__delattr__(key)
+
+    @property
+    def frozen(self):
+        return getattr(self, "_Freezable__frozen", False)
+
+    def _add_parent(self, parent):
+        """
+        Remember an object containing this one, so its cached digest is dropped when this object changes.
+        Only weak references are kept.
+        """
+        if self.frozen:
+            return
+        parents = getattr(self, "_Freezable__parents", None)
+        if parents is None:
+            parents = {}
+            object.__setattr__(self, "_Freezable__parents", parents)
+        parents[id(parent)] = ref(parent)
+
+    def _get_cached_digest(self):
+        """
+        :returns: bytes The cached digest of this object, None if there isn't one
+        """
+        return getattr(self, "_Freezable__digest", None)
+
+    def _invalidate(self):
+        """
+        Drop the cached digest of this object and of every object known to contain it.
+        Frozen objects keep theirs, they can't change.
+        """
+        if self.frozen or getattr(self, "_Freezable__digest", None) is None:
+            # if nothing is cached here, nothing containing this object can have a cached digest either
+            return
+        # cleared rather than deleted, so threads racing to invalidate the same object can't fail
+        object.__setattr__(self, "_Freezable__digest", None)
+        for parent_ref in tuple(getattr(self, "_Freezable__parents", {}).values()):
+            parent = parent_ref()
+            if parent is not None:
+                parent._invalidate()
+
+    def _set_cached_digest(self, digest):
+        object.__setattr__(self, "_Freezable__digest", digest)
+
+    def _on_mutate(self):
+        """
+        Called before any change to this object.
+        :raises TypeError: If this object is frozen.
+        """
+        if self.frozen:
+            raise TypeError("{cls} is frozen and cannot be modified.".format(cls=self.__class__.__name__))
+        self._invalidate()
+
+    def freeze(self):
+        """
+        Make this object and every Freezable object it contains immutable and hashable,
+        including Freezable objects inside dicts, lists, tuples and sets.
+        Values of other types (e.g. a dict stored in Data.value) are not frozen themselves.
+        :returns: self
+        """
+        if not self.frozen:
+            for v in self.__dict__.values():
+                _freeze(v)
+            object.__setattr__(self, "_Freezable__frozen", True)
+        return self
+
+    def get_digest(self):
+        """
+        Get a digest of this object's serializable form.
+        It is cached until this object, or an object in it, is modified through its attributes or Array methods.
+        :returns: bytes The same value as collection_plus_json.etag.digest(self.get_serializable())
+        """
+        from .etag import digest
+        return digest(self)
+
+    def thaw(self):
+        """
+        Get a mutable, shallow copy of this object.
+        Contained Arrays are copied so they can be added to or removed from, but the objects in them
+        stay shared (and frozen) until they are thawed and replaced themselves.
+        :returns: A new, unfrozen object of the same type
+        """
+        thawed = object.__new__(type(self))
+        for k, v in self.__dict__.items():
+            if isinstance(v, Array):
+                v = v.thaw()
+            thawed.__dict__[k] = v
+        return thawed
+
+
+class Array(Serializable, Freezable, Comparable, UserList):
     """
     A serializable, comparable list-like object that contains objects of a certain type.
     See: http://amundsen.com/media-types/collection/format/#arrays
@@ -163,7 +324,7 @@ class Array(Serializable, Comparable, UserList):
     def __add__(self, other):
         if type(self) is type(other):
             if self.required_class == other.required_class:
-                merged = self.data + other.data
+                merged = list(self.data) + list(other.data)
                 return Array(merged, self.required_class)
             else:
                 raise TypeError(
@@ -196,28 +357,75 @@ class Array(Serializable, Comparable, UserList):
             )
 
     def __eq__(self, other):
+        # frozen Arrays hold a tuple, so compare as lists
         if type(self) == type(other) and \
                 self.required_class == other.required_class and \
-                self.data == other.data:
+                list(self.data) == list(other.data):
             return True
         return False
 
     def __ne__(self, other):
         if type(self) != type(other) or \
                 self.required_class != other.required_class or \
-                self.data != other.data:
+                list(self.data) != list(other.data):
             return True
         return False
 
+    # defining __eq__ would otherwise unset this
+    __hash__ = Freezable.__hash__
+
+    def __copy__(self):
+        if self.frozen:
+            # like a tuple, a frozen Array can stand in for its own copy
+            return self
+        return super(Array, self).__copy__()
+
     def __repr__(self):
         return UserList.__repr__(self)
 
+    def __setitem__(self, i, item):
+        self._on_mutate()
+        super(Array, self).__setitem__(i, item)
+
+    def __delitem__(self, i):
+        self._on_mutate()
+        super(Array, self).__delitem__(i)
+
+    def __iadd__(self, other):
+        self._on_mutate()
+        return super(Array, self).__iadd__(other)
+
+    def __imul__(self, n):
+        self._on_mutate()
+        return super(Array, self).__imul__(n)
+
     def append(self, item):
+        self._on_mutate()
         if isinstance(item, self.required_class):
             super(Array, self).append(item)
         else:
             raise TypeError("item must be an instance of {type}".format(type=self.required_class.__name__))
 
+    def clear(self):
+        self._on_mutate()
+        super(Array, self).clear()
+
+    def extend(self, other):
+        self._on_mutate()
+        super(Array, self).extend(other)
+
+    def freeze(self):
+        """
+        Make this Array and every Freezable object in it immutable and hashable.
+        The contained objects are stored in a tuple, so Array.data cannot be changed in place either.
+        :returns: self
+        """
+        if not self.frozen:
+            for item in self.data:
+                _freeze(item)
+            self.data = tuple(self.data)
+        return super(Array, self).freeze()
+
     def get(self, **kwargs):
         """
         Find the first contained object that matches certain criteria
@@ -239,6 +447,22 @@ class Array(Serializable, Comparable, UserList):
                 data.append(item)
         return data
 
+    def insert(self, i, item):
+        self._on_mutate()
+        super(Array, self).insert(i, item)
+
+    def pop(self, i=-1):
+        self._on_mutate()
+        return super(Array, self).pop(i)
+
+    def remove(self, item):
+        self._on_mutate()
+        super(Array, self).remove(item)
+
+    def reverse(self):
+        self._on_mutate()
+        super(Array, self).reverse()
+
     def search(self, operator, *args, **kwargs):
         """
         Search for all contained objects that match certain criteria
@@ -263,8 +487,22 @@ class Array(Serializable, Comparable, UserList):
                 results.append(obj)
         return tuple(results)
 
+    def sort(self, *args, **kwargs):
+        self._on_mutate()
+        super(Array, self).sort(*args, **kwargs)
+
+    def thaw(self):
+        """
+        Get a mutable copy of this Array.
+        The objects in it are not copied, they stay shared (and frozen) until thawed and replaced themselves.
+        :returns: Array A new, unfrozen Array containing the same objects
+        """
+        thawed = super(Array, self).thaw()
+        thawed.data = list(self.data)
+        return thawed
+
 
-class Data(Serializable, Comparable):
+class Data(Serializable, Freezable, Comparable):
     """
     A dict-like object that contains some objects representing information about another object.
     Usually contained in an Array.
@@ -291,7 +529,7 @@ class Data(Serializable, Comparable):
             self.__setattr__(k, v)
 
 
-class Error(Serializable, Comparable):
+class Error(Serializable, Freezable, Comparable):
     """
     A dict-like object containing error information.
     See: http://amundsen.com/media-types/collection/format/#objects-error
@@ -313,7 +551,7 @@ class Error(Serializable, Comparable):
             self.__setattr__(k, v)
 
 
-class Link(Serializable, Comparable):
+class Link(Serializable, Freezable, Comparable):
     """
     A dict-like object containing information representing something as related to something else.
     Usually contained in an Array.
@@ -347,7 +585,7 @@ class Link(Serializable, Comparable):
             self.__setattr__(k, v)
 
 
-class Query(Serializable, Comparable):
+class Query(Serializable, Freezable, Comparable):
     """
     A dict-like object containing a form template related to the type of objects in the collection.
     Usually contained in an Array.
@@ -383,7 +621,7 @@ class Query(Serializable, Comparable):
             self.__setattr__(k, v)
 
 
-class Item(Serializable, Comparable):
+class Item(Serializable, Freezable, Comparable):
     """
     A dict-like object containing information representing something.
     http://amundsen.com/media-types/collection/format/#arrays-items
@@ -415,7 +653,7 @@ class Item(Serializable, Comparable):
             self.__setattr__(k, v)
 
 
-class Template(Serializable, Comparable):
+class Template(Serializable, Freezable, Comparable):
     """
     A dict-like object containing a template for objects in the containing collection.
     See: http://amundsen.com/media-types/collection/format/#objects-template
@@ -439,7 +677,7 @@ class Template(Serializable, Comparable):
             self.__setattr__(k, v)
 
 
-class Collection(Serializable, Comparable):
+class Collection(Serializable, Freezable, Comparable):
     """
     A dict-like object that contains a collection of information.
     See: http://amundsen.com/media-types/collection/format/#objects-collection
@@ -530,6 +768,15 @@ class Collection(Serializable, Comparable):
 
         super(Collection, self).__setattr__(key, value)
 
+    def etag(self):
+        """
+        Get a strong ETag for this collection's serialized form, for answering conditional requests.
+        Digests are cached for every object in the collection, so this is cheap while nothing has changed.
+        :returns: str A quoted ETag, e.g. '"3f786850e387550fdab836ed7e6dc881de23001b"'
+        """
+        from .etag import etag
+        return etag(self)
+
     def get_serializable(self):
         return {"collection": super(Collection, self).get_serializable()}
 
@@ -0,0 +1,118 @@
+__author__ = 'Ian S. Evans'
+
+from hashlib import sha1
+from json import dumps
+
+from .core import Array, Collection, Freezable, Serializable
+
+
+# Values are fed to their container's hash as parts. A nested object or array is "#" and its fixed-length digest,
+# a scalar is its JSON text and a NUL byte, which JSON text never contains, so parts can't run into each other.
+_encoded_keys = {}
+
+
+def _key(key):
+    try:
+        return _encoded_keys[key]
+    except KeyError:
+        encoded = dumps(key).encode("utf-8") + b":"
+        if len(_encoded_keys) < 1024:
+            _encoded_keys[key] = encoded
+        return encoded
+
+
+def _json_key(key):
+    # the key json.dumps writes for a dict key
+    if isinstance(key, str):
+        return key
+    if key is None or isinstance(key, (bool, int, float)):
+        return dumps(key)
+    raise TypeError("keys must be str, int, float, bool or None, not {type}".format(type=type(key).__name__))
+
+
+def _part(owner, value):
+    # owner is the nearest Freezable containing value, if any, even through plain dicts and lists
+    if isinstance(value, Freezable):
+        # a frozen owner's digest is never dropped, so it doesn't need to hear about changes
+        if owner is not None and not owner.frozen:
+            value._add_parent(owner)
+        return b"#" + _digest(value, None)
+    if isinstance(value, (Serializable, dict, list, tuple)):
+        return b"#" + _digest(value, owner)
+    return dumps(value).encode("utf-8") + b"\0"
+
+
+def array_digest(parts):
+    """
+    Combine the parts of a JSON array.
+    :param parts: iterable of bytes, in array order
+    :returns: bytes
+    """
+    h = sha1(b"[")
+    h.update(b"".join(parts))
+    return h.digest()
+
+
+def object_digest(entries):
+    """
+    Combine the parts of a JSON object. Key order does not matter.
+    Keys that are not strings are converted the way json.dumps converts them.
+    :param entries: iterable of (key, part) tuples
+    :returns: bytes
+    """
+    h = sha1(b"{")
+    h.update(b"".join(_key(key) + part for key, part in sorted((_json_key(k), p) for k, p in entries)))
+    return h.digest()
+
+
+def digest(value):
+    """
+    Get a digest of a serializable object, or of the output of its get_serializable().
+    Both give the same digest for the same content.
+    Digests of Freezable objects are cached on them, and dropped when they are modified through their
+    attributes or Array methods. Changes made any other way (e.g. to a dict in Data.value, or directly to
+    Array.data) are not noticed; thaw and replace the object instead, or build a new one.
+    :param value: A Serializable object, or any value that can be dumped with json.dumps
+    :returns: bytes
+    """
+    return _digest(value, None)
+
+
+def _digest(value, owner):
+    if isinstance(value, Freezable):
+        d = value._get_cached_digest()
+        if d is not None:
+            return d
+        get_serializable = type(value).get_serializable
+        if get_serializable is Array.get_serializable:
+            d = array_digest([_part(value, v) for v in value.data])
+        elif get_serializable in (Serializable.get_serializable, Collection.get_serializable):
+            # the same values Serializable.get_serializable() leaves in
+            d = object_digest([(k, _part(value, v)) for k, v in value.__dict__.items() if v])
+            if get_serializable is Collection.get_serializable:
+                d = object_digest([("collection", b"#" + d)])
+        else:
+            # a subclass decides what it serializes, so hash that,
+            # but still cache the digests of its properties so changes to them are noticed
+            for v in value.__dict__.values():
+                _part(value, v)
+            d = _digest(value.get_serializable(), value)
+        # no lock needed, racing threads would compute and store the same value
+        value._set_cached_digest(d)
+        return d
+    if isinstance(value, Serializable):
+        return _digest(value.get_serializable(), owner)
+    if isinstance(value, dict):
+        return object_digest([(k, _part(owner, v)) for k, v in value.items()])
+    if isinstance(value, (list, tuple)):
+        return array_digest([_part(owner, v) for v in value])
+    return sha1(_part(None, value)).digest()
+
+
+def etag(value):
+    """
+    Get a strong ETag for a serializable object, or for the output of its get_serializable().
+    :param value: A Serializable object, or any value that can be dumped with json.dumps
+    :returns: str A quoted ETag, for use in ETag and If-None-Match headers
+    """
+    return '"{digest}"'.format(digest=digest(value).hex())
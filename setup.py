@@ -1,4 +1,3 @@
-
 import collection_plus_json
 from setuptools import setup
 
@@ -9,5 +8,7 @@ setup(
     license="MIT",
     author=collection_plus_json.__author__,
     description="Some python bindings for the Collection+JSON Hypermedia Type",
+    packages=["collection_plus_json"],
+    python_requires=">=3.7",
     test_suite="tests.test_all"
-)
\ No newline at end of file
+)
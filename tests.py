@@ -1,8 +1,14 @@
 __author__ = 'Ian S. Evans'
 
+import copy
+import io
 import json
+import subprocess
+import sys
+import time
 
 from collection_plus_json import Array, Collection, Data, Error, Item, Link, Query, Template
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase, TestSuite
 
 # TODO: write tests
@@ -129,6 +135,22 @@ class ArrayTests(TestCase):
         with self.assertRaises(TypeError):
             type1_array_1 - "this should fail"
 
+    def test_copy(self):
+        """copy.copy() of an Array should give a usable Array, frozen or not."""
+
+        foo_array = Array(['foo', 'bar', 'baz'], str)
+
+        mutable_copy = copy.copy(foo_array)
+        mutable_copy.append('biz')
+        self.assertEqual(foo_array, Array(['foo', 'bar', 'baz'], str))
+
+        foo_array.freeze()
+        frozen_copy = copy.copy(foo_array)
+        self.assertTrue(frozen_copy.frozen)
+        self.assertEqual(frozen_copy, foo_array)
+        with self.assertRaises(TypeError):
+            frozen_copy.append('biz')
+
     def test_serializable(self):
         """Array.get_serializable() should return an object that can be dumped into a string with json.dumps."""
 
@@ -166,6 +188,344 @@ class ArrayTests(TestCase):
 
 
 # Collection tests
+class CollectionTests(TestCase):
+
+    def setUp(self):
+        self.collection = Collection(
+            href="http://example.com/people/",
+            items=[
+                {
+                    "href": "http://example.com/people/1",
+                    "data": [{"name": "full-name", "value": "J. Doe"}],
+                    "links": [{"href": "http://example.com/people/1/blog", "rel": "blog"}]
+                }
+            ],
+            template={"data": [{"name": "full-name", "prompt": "Full Name"}]}
+        )
+
+    def test_freeze(self):
+        """Collection.freeze() should make the whole tree immutable and hashable."""
+
+        serialized = str(self.collection)
+        frozen = self.collection.freeze()
+
+        self.assertIs(frozen, self.collection)
+        self.assertTrue(frozen.frozen)
+        self.assertTrue(frozen.items.frozen)
+        self.assertTrue(frozen.items[0].data[0].frozen)
+        self.assertTrue(frozen.template.frozen)
+
+        # Freezing should not change the serialized form
+        self.assertEqual(str(frozen), serialized)
+
+        # Mutators should raise a TypeError at every level of the tree
+        with self.assertRaises(TypeError):
+            frozen.href = "http://example.com/other/"
+        with self.assertRaises(TypeError):
+            del frozen.template
+        with self.assertRaises(TypeError):
+            frozen.items.append(Item(href="http://example.com/people/2"))
+        with self.assertRaises(TypeError):
+            del frozen.items[0]
+        with self.assertRaises(TypeError):
+            frozen.items[0].data[0].value = "R. Roe"
+
+        # Array.data should not be mutable in place either
+        with self.assertRaises(AttributeError):
+            frozen.items.data.append(Item(href="http://example.com/people/2"))
+
+        # Frozen objects should be hashable, unfrozen ones should not
+        self.assertEqual(hash(frozen), hash(frozen))
+        self.assertIn(frozen.items[0], {frozen.items[0]})
+        with self.assertRaises(TypeError):
+            hash(Item(href="http://example.com/people/2"))
+
+    def test_freeze_private_names(self):
+        """Non-standard properties should not be mistaken for the state freeze() keeps."""
+
+        item = Item(href="http://example.com/people/2", _frozen=True)
+
+        self.assertFalse(item.frozen)
+        self.assertIn('"_frozen": true', str(item))
+
+        item.freeze()
+        self.assertTrue(item.data.frozen)
+        self.assertTrue(item.links.frozen)
+
+    def test_freeze_hash(self):
+        """Frozen objects that compare equal should hash equal."""
+
+        pairs = [
+            (Data(name="a", value=1), Data(name="a", value=1.0)),
+            (Data(name="a", value=True), Data(name="a", value=1)),
+            (Data(name="a", value={"k": [1]}), Data(name="a", value={"k": [1.0]})),
+            (Array([Link(href="h", rel="r")], Link), Array([Link(href="h", rel="r")], Link))
+        ]
+
+        for first, second in pairs:
+            first.freeze()
+            second.freeze()
+            self.assertEqual(first, second)
+            self.assertEqual(hash(first), hash(second))
+            self.assertIn(second, {first})
+
+    def test_thaw(self):
+        """Collection.thaw() should return a mutable copy that shares unmodified objects."""
+
+        frozen = self.collection.freeze()
+        thawed = frozen.thaw()
+
+        self.assertFalse(thawed.frozen)
+        self.assertFalse(thawed.items.frozen)
+        self.assertEqual(thawed, frozen)
+
+        # Contained objects are shared until thawed themselves
+        self.assertIs(thawed.items[0], frozen.items[0])
+        self.assertTrue(thawed.items[0].frozen)
+
+        thawed.href = "http://example.com/other/"
+        thawed.items.append(Item(href="http://example.com/people/2"))
+        thawed.items[0] = thawed.items[0].thaw()
+        thawed.items[0].href = "http://example.com/people/3"
+
+        # The frozen original should be unchanged
+        self.assertEqual(frozen.href, "http://example.com/people/")
+        self.assertEqual(len(frozen.items), 1)
+        self.assertEqual(frozen.items[0].href, "http://example.com/people/1")
+
+    def test_etag(self):
+        """Collection.etag() should be cached, change when the collection does, and match its serialized form."""
+
+        from collection_plus_json.etag import etag
+
+        original = self.collection.etag()
+
+        self.assertEqual(self.collection.etag(), original)
+        self.assertEqual(etag(self.collection.get_serializable()), original)
+        self.assertEqual(etag(json.loads(str(self.collection))), original)
+        self.assertTrue(original.startswith('"') and original.endswith('"'))
+
+        # Changes anywhere in the tree should change the ETag
+        self.collection.items[0].data[0].value = "R. Roe"
+        changed = self.collection.etag()
+        self.assertNotEqual(changed, original)
+        self.assertEqual(etag(self.collection.get_serializable()), changed)
+
+        self.collection.items.append(Item(href="http://example.com/people/2"))
+        self.assertNotEqual(self.collection.etag(), changed)
+
+        # Changing things back should give back the same ETag
+        del self.collection.items[1]
+        self.collection.items[0].data[0].value = "J. Doe"
+        self.assertEqual(self.collection.etag(), original)
+
+        # Frozen and thawed copies should agree with the original until modified
+        self.collection.freeze()
+        thawed = self.collection.thaw()
+        self.assertEqual(self.collection.etag(), original)
+        self.assertEqual(thawed.etag(), original)
+        thawed.href = "http://example.com/other/"
+        self.assertNotEqual(thawed.etag(), original)
+        self.assertEqual(self.collection.etag(), original)
+
+    def test_etag_nested(self):
+        """Collection.etag() should handle Serializable objects inside plain dict and list values."""
+
+        from collection_plus_json.etag import etag
+
+        link = Link(href="http://example.com/people/1/blog", rel="blog")
+        self.collection.extra = [link]
+        self.collection.items[0].data[0].value = {"blog": Link(href="http://example.com/blog", rel="blog")}
+
+        original = self.collection.etag()
+        self.assertEqual(etag(json.loads(str(self.collection))), original)
+
+        # Changes to an object inside a plain list should still be noticed
+        link.rel = "alternate"
+        self.assertNotEqual(self.collection.etag(), original)
+        self.assertEqual(etag(json.loads(str(self.collection))), self.collection.etag())
+
+        self.collection.freeze()
+        self.assertEqual(hash(self.collection), hash(self.collection))
+
+    def test_etag_keys(self):
+        """Collection.etag() should treat dict keys that aren't strings the way json.dumps does."""
+
+        from collection_plus_json.etag import etag
+
+        self.collection.items[0].data[0].value = {1: "x", "b": 2, True: None, None: 1.5}
+
+        self.assertEqual(etag(json.loads(str(self.collection))), self.collection.etag())
+
+    def test_etag_get_serializable(self):
+        """Collection.etag() should follow subclasses that override get_serializable()."""
+
+        from collection_plus_json.etag import etag
+
+        class Person(Item):
+            def get_serializable(self):
+                serializable = super(Person, self).get_serializable()
+                serializable["kind"] = "person"
+                return serializable
+
+        person = Person(href="http://example.com/people/2", data=[{"name": "full-name", "value": "R. Roe"}])
+        self.collection.items.append(person)
+        self.assertEqual(self.collection.etag(), etag(json.loads(str(self.collection))))
+
+        original = self.collection.etag()
+        person.data[0].value = "S. Smith"
+        self.assertNotEqual(self.collection.etag(), original)
+        self.assertEqual(self.collection.etag(), etag(json.loads(str(self.collection))))
+
+    def test_etag_frozen(self):
+        """The digest of a frozen object should never be dropped."""
+
+        link = Link(href="http://example.com/people/1/blog", rel="blog")
+        data = Data(name="blog", value={"link": link}).freeze()
+        data_hash = hash(data)
+
+        # freeze() reaches Freezable objects inside plain values
+        self.assertTrue(link.frozen)
+        with self.assertRaises(TypeError):
+            link.rel = "alternate"
+
+        # one added to a plain value afterwards can still change, but the frozen object's digest stays put
+        late = Link(href="http://example.com/people/1/home", rel="home")
+        data.value["late"] = late
+        digest = data.get_digest()
+        late.rel = "alternate"
+        self.assertEqual(data.get_digest(), digest)
+        self.assertEqual(hash(data), data_hash)
+
+    def test_etag_private_names(self):
+        """Non-standard properties should not be mistaken for the state etag() keeps."""
+
+        from collection_plus_json.etag import etag
+
+        collection = Collection(href="http://example.com/people/", _digest="abc", _parents=1)
+
+        self.assertIn('"_digest": "abc"', str(collection))
+        self.assertEqual(collection.etag(), etag(json.loads(str(collection))))
+        self.assertEqual(etag(Item(href="http://example.com/people/1", _parents=1)),
+                         etag({"href": "http://example.com/people/1", "_parents": 1}))
+
+
+# Batch tests
+class BatchValidatorTests(TestCase):
+
+    def setUp(self):
+        lines = [
+            '{"href": "http://example.com/people/{i}", "data": [{"name": "full-name", "value": "Person {i}"}]}'.replace(
+                "{i}", str(i)
+            ) for i in range(1, 11)
+        ]
+        lines[2] = 'not json'
+        lines[4] = '["not", "an", "object"]'
+        lines[6] = '{"href": ""}'
+        lines[7] = ''
+        self.stream = "\n".join(lines) + "\n"
+
+    def check_results(self, validator, items):
+        self.assertEqual(
+            [item.href for item in items],
+            ["http://example.com/people/{i}".format(i=i) for i in (1, 2, 4, 6, 9, 10)]
+        )
+        self.assertTrue(all(isinstance(item, Item) for item in items))
+
+        # Blank lines are skipped, bad lines become Errors that know their line number
+        self.assertEqual(validator.lines, 9)
+        self.assertEqual(validator.valid, 6)
+        self.assertEqual([error.line for error in validator.errors], [3, 5, 7])
+        self.assertTrue(all(isinstance(error, Error) for error in validator.errors))
+
+    def test_validate(self):
+        """BatchValidator.validate() should yield valid Items in order and collect Errors for the rest."""
+
+        from collection_plus_json import BatchValidator
+
+        validator = BatchValidator(chunk_size=2)
+        self.check_results(validator, list(validator.validate(io.StringIO(self.stream))))
+
+    def test_validate_executor(self):
+        """BatchValidator.validate() should keep the original order when chunks go to an executor."""
+
+        from collection_plus_json import BatchValidator
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            validator = BatchValidator(executor=executor, chunk_size=2, max_pending=2)
+            self.check_results(validator, list(validator.validate(io.StringIO(self.stream))))
+
+    def test_validate_private_keys(self):
+        """BatchValidator.validate() should record an Error for lines with keys starting with an underscore."""
+
+        from collection_plus_json import BatchValidator
+
+        stream = "\n".join([
+            '{"href": "http://example.com/people/1"}',
+            '{"href": "http://example.com/people/2", "__dict__": {}}',
+            '{"href": "http://example.com/people/3", "_frozen": true}',
+            '{"href": "http://example.com/people/4", "_digest": "abc"}',
+            '{"href": "http://example.com/people/5", "extra": "allowed"}'
+        ])
+        validator = BatchValidator()
+        items = list(validator.validate(io.StringIO(stream)))
+
+        self.assertEqual([item.href for item in items], ["http://example.com/people/1", "http://example.com/people/5"])
+        self.assertEqual([error.line for error in validator.errors], [2, 3, 4])
+
+    def test_validate_elapsed(self):
+        """BatchValidator.elapsed should not include time spent by the consumer between Items."""
+
+        from collection_plus_json import BatchValidator
+
+        validator = BatchValidator(chunk_size=2)
+        for _ in validator.validate(io.StringIO(self.stream)):
+            time.sleep(0.05)
+
+        self.assertLess(validator.elapsed, 0.05)
+        self.assertGreater(validator.lines_per_second, 0)
+
+    def test_validate_nested(self):
+        """BatchValidator.validate() should record an Error for a pathologically nested line and carry on."""
+
+        from collection_plus_json import BatchValidator
+
+        stream = "\n".join([
+            '{"href": "http://example.com/people/1"}',
+            "[" * 100000,
+            '{"href": "http://example.com/people/2", "data": [{"name": "nested", "value": ' + "[" * 100000 + '}]}',
+            '{"href": "http://example.com/people/3"}'
+        ])
+        validator = BatchValidator()
+        items = list(validator.validate(io.StringIO(stream)))
+
+        self.assertEqual([item.href for item in items], ["http://example.com/people/1", "http://example.com/people/3"])
+        self.assertEqual([error.line for error in validator.errors], [2, 3])
+
+
+# Package tests
+class PackageTests(TestCase):
+
+    def test_lazy_import(self):
+        """Importing the package should not import the submodules it loads on first use."""
+
+        code = (
+            "import sys, collection_plus_json; "
+            "print(' '.join(sorted(m for m in sys.modules if m.startswith('collection_plus_json.'))))"
+        )
+        output = subprocess.check_output([sys.executable, "-c", code], universal_newlines=True)
+
+        self.assertEqual(output.split(), ["collection_plus_json.core"])
+
+    def test_star_import(self):
+        """from collection_plus_json import * should include lazily loaded names, and no helpers."""
+
+        namespace = {}
+        exec("from collection_plus_json import *", namespace)
+
+        self.assertIn("Collection", namespace)
+        self.assertIn("BatchValidator", namespace)
+        self.assertNotIn("import_module", namespace)
 
 
 def test_all():
@@ -173,6 +533,24 @@ def test_all():
     test_suite.addTest(ArrayTests('test_comparison'))
     test_suite.addTest(ArrayTests('test_addition'))
     test_suite.addTest(ArrayTests('test_subtraction'))
+    test_suite.addTest(ArrayTests('test_copy'))
     test_suite.addTest(ArrayTests('test_serializable'))
     test_suite.addTest(ArrayTests('test_string'))
+    test_suite.addTest(CollectionTests('test_freeze'))
+    test_suite.addTest(CollectionTests('test_freeze_private_names'))
+    test_suite.addTest(CollectionTests('test_freeze_hash'))
+    test_suite.addTest(CollectionTests('test_thaw'))
+    test_suite.addTest(CollectionTests('test_etag'))
+    test_suite.addTest(CollectionTests('test_etag_nested'))
+    test_suite.addTest(CollectionTests('test_etag_keys'))
+    test_suite.addTest(CollectionTests('test_etag_get_serializable'))
+    test_suite.addTest(CollectionTests('test_etag_frozen'))
+    test_suite.addTest(CollectionTests('test_etag_private_names'))
+    test_suite.addTest(BatchValidatorTests('test_validate'))
+    test_suite.addTest(BatchValidatorTests('test_validate_executor'))
+    test_suite.addTest(BatchValidatorTests('test_validate_private_keys'))
+    test_suite.addTest(BatchValidatorTests('test_validate_elapsed'))
+    test_suite.addTest(BatchValidatorTests('test_validate_nested'))
+    test_suite.addTest(PackageTests('test_lazy_import'))
+    test_suite.addTest(PackageTests('test_star_import'))
     return test_suite